@@ -4,18 +4,21 @@ PathFinder - A lightning-fast web reconnaissance tool
 """
 
 import sys
+import ssl
 import asyncio
-import aiohttp
-import dns.resolver
-from typing import List, Dict, Optional, Union
+import httpx
+import aiodns
+import orjson
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Sequence, Union
 from pathlib import Path
 import argparse
 from datetime import datetime
-import json
 import csv
 import logging
 import os
 import re
+import time
+import uuid
 from rich.console import Console
 from rich.progress import Progress
 
@@ -25,8 +28,23 @@ __author__ = "Zeeshan01001"
 # Get the directory where pathfinder.py is located
 PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Progress bar updates are batched so redraws don't dominate large scans
+PROGRESS_BATCH = 32
+PROGRESS_INTERVAL = 0.1
+
+# Bodies are only measured, so stop downloading once this many bytes arrive
+MAX_BODY_BYTES = 8192
+
 console = Console()
 
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+# httpx logs every request at INFO, which would flood the scan output
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
 class PathFinder:
     def __init__(
         self,
@@ -39,9 +57,12 @@ class PathFinder:
         verify_ssl: bool = True,
         user_agent: str = None,
         output_format: str = "txt",
-        simple_mode: bool = False
+        simple_mode: bool = False,
+        ipv4_only: bool = False,
+        show_codes: List[int] = None
     ):
         self.target = target.rstrip("/")
+        self._target_prefix = self.target + "/"
         self.simple_mode = simple_mode
         
         # In simple mode, use smaller wordlist and common web extensions
@@ -63,16 +84,35 @@ class PathFinder:
         self.verify_ssl = verify_ssl
         self.user_agent = user_agent or f"PathFinder/{__version__}"
         self.output_format = output_format
+        self.ipv4_only = ipv4_only
+        if show_codes:
+            self._interesting_codes = frozenset(show_codes)
+        else:
+            # 304 only answers conditional requests, which the scanner never sends
+            self._interesting_codes = frozenset(range(200, 400)) - {304}
+        
+        # Expand extension variants once instead of on every scan
+        suffixes = [(ext, f".{ext}".lower()) for ext in self.types]
+        probe = []
+        for path in self.wordlist:
+            # Strip leading slashes first so '/admin' and 'admin' dedupe to one URL
+            path = path.lstrip('/')
+            probe.append(path)
+            lowered = path.lower()
+            probe.extend(f"{path}.{ext}" for ext, suffix in suffixes if not lowered.endswith(suffix))
+        # Drop repeated paths while keeping wordlist order
+        self._probe_paths = tuple(dict.fromkeys(probe))
         
         self.results = []
         self.session = None
-        self.dns_resolver = dns.resolver.Resolver()
+        self._ssl_ctx = ssl.create_default_context() if verify_ssl else False
+        # aiodns binds its resolver to the running loop, so it is built lazily
+        self._aio_resolver = None
+        self._wildcard_ips = set()
+        self._baseline_sig = None
         
-        logging.basicConfig(
-            level=logging.INFO if not simple_mode else logging.WARNING,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
         self.logger = logging.getLogger("PathFinder")
+        self.logger.setLevel(logging.INFO if not simple_mode else logging.WARNING)
 
     def _load_wordlist(self, wordlist: Union[str, List[str]]) -> List[str]:
         """Load wordlist from file or list."""
@@ -83,95 +123,223 @@ class PathFinder:
         if not wordlist_path.exists():
             raise FileNotFoundError(f"Wordlist not found: {wordlist}")
         
-        paths = []
-        with open(wordlist_path) as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if line and not line.startswith('#'):
-                    paths.append(line)
+        with open(wordlist_path, 'rb') as f:
+            lines = f.read().decode().splitlines()
+        
+        # Skip empty lines and comments; interning shares storage between repeated entries
+        paths = [sys.intern(line) for line in map(str.strip, lines) if line and line[0] != '#']
         
         if not paths:
             raise ValueError("Wordlist is empty")
             
         return paths
 
+    async def __aenter__(self):
+        """Open the HTTP session for the lifetime of an async with block."""
+        await self._init_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the HTTP session."""
+        await self._close_session()
+
     async def _init_session(self):
         """Initialize HTTP session."""
         if self.session is None:
-            self.session = aiohttp.ClientSession(
+            # HTTP/2 multiplexes probes over one pooled TCP+TLS connection when the target supports it;
+            # HTTP/1.1 connections only return to the pool once _check_url has drained the response
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                verify=self._ssl_ctx,
+                limits=httpx.Limits(
+                    max_connections=self.threads * 4,
+                    max_keepalive_connections=self.threads,
+                    keepalive_expiry=30
+                ),
+                # Binding to the IPv4 wildcard address skips AAAA lookups at the cost of IPv6-only targets
+                local_address="0.0.0.0" if self.ipv4_only else None
+            )
+            self.session = httpx.AsyncClient(
+                transport=transport,
                 headers={"User-Agent": self.user_agent},
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
+                timeout=self.timeout
             )
 
     async def _close_session(self):
         """Close HTTP session."""
         if self.session:
-            await self.session.close()
+            await self.session.aclose()
             self.session = None
 
     async def _check_url(self, path: str) -> Optional[Dict]:
         """Check if a URL exists."""
-        url = f"{self.target}/{path.lstrip('/')}"
+        url = self._target_prefix + path
         try:
-            async with self.session.get(url, ssl=self.verify_ssl, allow_redirects=False) as response:
+            async with self.session.stream("GET", url) as response:
+                content_length = response.headers.get('Content-Length')
+                truncated = False
+                if content_length is not None:
+                    content_length = int(content_length)
+                
+                # Small bodies are drained so HTTP/1.1 connections go back to the pool;
+                # only large or unbounded ones are abandoned, at the cost of their connection
+                if content_length is None or content_length <= MAX_BODY_BYTES:
+                    received = 0
+                    async for chunk in response.aiter_raw():
+                        received += len(chunk)
+                        if received > MAX_BODY_BYTES:
+                            truncated = content_length is None
+                            break
+                    if content_length is None:
+                        # Only a lower bound is known, so report the cap rather than a chunking artefact
+                        content_length = MAX_BODY_BYTES if truncated else received
                 return {
                     'url': url,
-                    'status_code': response.status,
-                    'content_length': len(await response.read()),
+                    'path': path,
+                    'status_code': response.status_code,
+                    'content_length': content_length or 0,
+                    'content_truncated': truncated,
                     'redirect_location': response.headers.get('Location'),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': time.time()
                 }
-        except aiohttp.ClientError as e:
-            self.logger.debug(f"Error checking {url}: {str(e)}")
+        except (httpx.HTTPError, ValueError) as e:
+            self.logger.debug("Error checking %s: %s", url, e)
             return None
 
+    async def _as_completed(self, func: Callable[[Any], Awaitable], items: Sequence,
+                            progress: Progress, task) -> AsyncIterator:
+        """Run func over items on self.threads workers, yielding (index, result) as they finish.
+
+        Workers pull from a shared iterator, so only self.threads calls are in
+        flight at once and memory stays bounded regardless of wordlist size.
+        """
+        loop = asyncio.get_running_loop()
+        pending = enumerate(items)
+        finished = asyncio.Queue()
+
+        async def _worker():
+            for index, item in pending:
+                try:
+                    result = await func(item)
+                except Exception as e:
+                    self.logger.debug("Error during scan: %s", e)
+                    result = None
+                await finished.put((index, result))
+
+        workers = [asyncio.ensure_future(_worker()) for _ in range(self.threads)]
+        advanced = 0
+        last_update = loop.time()
+        
+        try:
+            for _ in range(len(items)):
+                index, result = await finished.get()
+                
+                advanced += 1
+                if advanced >= PROGRESS_BATCH or loop.time() - last_update >= PROGRESS_INTERVAL:
+                    progress.update(task, advance=advanced)
+                    advanced = 0
+                    last_update = loop.time()
+                
+                yield index, result
+        finally:
+            for worker in workers:
+                worker.cancel()
+        
+        if advanced:
+            progress.update(task, advance=advanced)
+
+    async def _detect_soft_404(self):
+        """Fingerprint how the target answers a nonexistent path."""
+        baseline = await self._check_url(f"pf-nonexistent-{uuid.uuid4().hex}")
+        # A truncated length is shared by every large page, so it cannot fingerprint one
+        if (baseline is None or baseline['content_truncated']
+                or not 200 <= baseline['status_code'] < 400):
+            self._baseline_sig = None
+            return
+        
+        self._baseline_sig = (baseline['status_code'], baseline['content_length'])
+        if not self.simple_mode:
+            console.print(
+                f"[yellow][!][/] Target answers unknown paths with status {baseline['status_code']}, "
+                f"ignoring matching responses\n"
+            )
+
     async def scan_directories(self):
         """Scan for directories and files."""
         await self._init_session()
-        try:
-            if self.simple_mode:
-                console.print("🔍 Starting quick scan...\n")
-            else:
-                console.print(f"\n🔍 PathFinder v{__version__} - Scanning {self.target}\n")
+        if self.simple_mode:
+            console.print("🔍 Starting quick scan...\n")
+        else:
+            console.print(f"\n🔍 PathFinder v{__version__} - Scanning {self.target}\n")
+        
+        await self._detect_soft_404()
+
+        with Progress(refresh_per_second=10, transient=True) as progress:
+            task = progress.add_task(
+                "[cyan]Quick scan in progress..." if self.simple_mode else "[cyan]Scanning directories...",
+                total=len(self._probe_paths)
+            )
             
-            with Progress() as progress:
-                task = progress.add_task(
-                    "[cyan]Quick scan in progress..." if self.simple_mode else "[cyan]Scanning directories...",
-                    total=len(self.wordlist)
-                )
+            found = []
+            async for index, result in self._as_completed(self._check_url, self._probe_paths, progress, task):
+                if not isinstance(result, dict):
+                    continue
+                if (not result['content_truncated']
+                        and (result['status_code'], result['content_length']) == self._baseline_sig):
+                    continue
+                found.append((index, result))
                 
-                for i in range(0, len(self.wordlist), self.threads):
-                    batch = self.wordlist[i:i + self.threads]
-                    tasks = []
-                    
-                    for path in batch:
-                        tasks.append(self._check_url(path))
-                        for ext in self.types:
-                            if not path.endswith(ext):
-                                tasks.append(self._check_url(f"{path}.{ext}"))
-                    
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-                    valid_results = [r for r in results if isinstance(r, dict)]
-                    self.results.extend(valid_results)
-                    
-                    progress.update(task, advance=len(batch))
-                    
-                    for result in valid_results:
-                        if 200 <= result['status_code'] < 400:
-                            path = result['url'].replace(self.target, '')
-                            console.print(
-                                f"[green]✓[/] Found: {path}"
-                                if self.simple_mode else
-                                f"[green][+][/] Found: {path} (Status: {result['status_code']})"
-                            )
-            
-            if self.simple_mode:
-                console.print(f"\n✨ Done! Found {len(self.results)} paths\n")
-            else:
-                console.print(f"\n✨ Scan completed! Found {len(self.results)} results.\n")
-        finally:
-            await self._close_session()
+                if result['status_code'] in self._interesting_codes:
+                    console.print(
+                        f"[green]✓[/] Found: /{result['path']}"
+                        if self.simple_mode else
+                        f"[green][+][/] Found: /{result['path']} (Status: {result['status_code']})"
+                    )
+        
+        # Output streams in completion order, but results keep wordlist order for export
+        found.sort(key=lambda item: item[0])
+        self.results.extend(result for _, result in found)
+        
+        if self.simple_mode:
+            console.print(f"\n✨ Done! Found {len(self.results)} paths\n")
+        else:
+            console.print(f"\n✨ Scan completed! Found {len(self.results)} results.\n")
+
+    async def _detect_wildcard(self):
+        """Record the IPs a wildcard DNS record returns for nonexistent labels."""
+        probe = f"pf-probe-{uuid.uuid4().hex}.{self.target}"
+        try:
+            answers = await self._aio_resolver.query(probe, 'A')
+        except aiodns.error.DNSError:
+            self._wildcard_ips = set()
+            return
+        
+        self._wildcard_ips = {rdata.host for rdata in answers}
+        if not self.simple_mode:
+            console.print(
+                f"[yellow][!][/] Wildcard DNS detected, ignoring results for: "
+                f"{', '.join(sorted(self._wildcard_ips))}\n"
+            )
+
+    async def _resolve_one(self, subdomain: str) -> List[Dict]:
+        """Resolve a single subdomain to its A records."""
+        full_domain = f"{subdomain}.{self.target}"
+        try:
+            answers = await self._aio_resolver.query(full_domain, 'A')
+        except aiodns.error.DNSError as e:
+            if e.args and e.args[0] not in (aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA):
+                self.logger.debug("Error resolving %s: %s", full_domain, e)
+            return []
+        
+        return [
+            {
+                'subdomain': full_domain,
+                'ip': rdata.host,
+                'timestamp': time.time()
+            }
+            for rdata in answers
+            if rdata.host not in self._wildcard_ips
+        ]
 
     async def scan_subdomains(self):
         """Scan for subdomains."""
@@ -180,41 +348,43 @@ class PathFinder:
         else:
             console.print(f"\n🔍 PathFinder v{__version__} - Scanning subdomains of {self.target}\n")
         
-        with Progress() as progress:
+        if self._aio_resolver is None:
+            self._aio_resolver = aiodns.DNSResolver(timeout=self.timeout)
+        await self._detect_wildcard()
+        # Resolve and report each label once, keeping wordlist order
+        subdomains = tuple(dict.fromkeys(self.wordlist))
+        
+        with Progress(refresh_per_second=10, transient=True) as progress:
             task = progress.add_task(
                 "[cyan]Quick search in progress..." if self.simple_mode else "[cyan]Scanning subdomains...",
-                total=len(self.wordlist)
+                total=len(subdomains)
             )
-            found = 0
+            found = []
             
-            for subdomain in self.wordlist:
-                full_domain = f"{subdomain}.{self.target}"
-                try:
-                    answers = self.dns_resolver.resolve(full_domain)
-                    for rdata in answers:
-                        result = {
-                            'subdomain': full_domain,
-                            'ip': str(rdata),
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        self.results.append(result)
-                        console.print(
-                            f"[green]✓[/] Found: {full_domain}"
-                            if self.simple_mode else
-                            f"[green][+][/] Found: {full_domain} -> {rdata}"
-                        )
-                        found += 1
-                except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
-                    pass
-                except Exception as e:
-                    self.logger.debug(f"Error resolving {full_domain}: {str(e)}")
-                
-                progress.update(task, advance=1)
+            async for index, results in self._as_completed(self._resolve_one, subdomains, progress, task):
+                for result in results or []:
+                    found.append((index, result))
+                    console.print(
+                        f"[green]✓[/] Found: {result['subdomain']}"
+                        if self.simple_mode else
+                        f"[green][+][/] Found: {result['subdomain']} -> {result['ip']}"
+                    )
+            
+            # Output streams in completion order, but results keep wordlist order for export
+            found.sort(key=lambda item: item[0])
+            self.results.extend(result for _, result in found)
             
             if self.simple_mode:
-                console.print(f"\n✨ Done! Found {found} subdomains\n")
+                console.print(f"\n✨ Done! Found {len(found)} subdomains\n")
             else:
-                console.print(f"\n✨ Scan completed! Found {found} subdomains.\n")
+                console.print(f"\n✨ Scan completed! Found {len(found)} subdomains.\n")
+
+    def _export_rows(self) -> List[Dict]:
+        """Return results with their epoch timestamps converted to ISO format."""
+        return [
+            {**result, 'timestamp': datetime.fromtimestamp(result['timestamp']).isoformat()}
+            for result in self.results
+        ]
 
     def export_results(self, output_file: str):
         """Export results to file."""
@@ -224,8 +394,8 @@ class PathFinder:
         output_path = Path(output_file)
         
         if self.output_format == "json":
-            with open(output_path, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(self._export_rows(), option=orjson.OPT_INDENT_2))
         
         elif self.output_format == "csv":
             if not self.results:
@@ -235,17 +405,38 @@ class PathFinder:
             with open(output_path, 'w', newline='') as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
-                writer.writerows(self.results)
+                writer.writerows(self._export_rows())
         
         else:  # txt format
             with open(output_path, 'w') as f:
                 for result in self.results:
                     if 'url' in result:
-                        path = result['url'].replace(self.target, '')
-                        f.write(f"{path} - Status: {result['status_code']}\n")
+                        path = result.get('path') or result['url'][len(self._target_prefix):]
+                        f.write(f"/{path} - Status: {result['status_code']}\n")
                     else:
                         f.write(f"{result['subdomain']} -> {result['ip']}\n")
 
+def _status_codes(value: str) -> List[int]:
+    """Parse a comma-separated list of HTTP status codes for argparse."""
+    codes = []
+    for code in value.split(','):
+        code = code.strip()
+        if not code.isdigit() or not 100 <= int(code) <= 599:
+            raise argparse.ArgumentTypeError(f"invalid status code: {code!r}")
+        codes.append(int(code))
+    return codes
+
+def _run_event_loop(coro: Awaitable):
+    """Run a coroutine on uvloop (or winloop on Windows) when installed, else asyncio's default loop."""
+    try:
+        if sys.platform == "win32":
+            import winloop as uvloop
+        else:
+            import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
 def main():
     parser = argparse.ArgumentParser(
         description="🔍 PathFinder - Lightning-Fast Web Scanner with 150+ Common Paths",
@@ -271,6 +462,8 @@ Examples:
     parser.add_argument('--no-ssl', action='store_true', help="Skip SSL verification")
     parser.add_argument('--format', choices=['txt', 'json', 'csv'], default='txt', help="Output format")
     parser.add_argument('--simple', action='store_true', help="Simple output mode")
+    parser.add_argument('--show-codes', type=_status_codes, help="Status codes to report as found (default: 200-399 except 304)")
+    parser.add_argument('--ipv4-only', action='store_true', help="Only connect over IPv4 (skips AAAA lookups)")
 
     args = parser.parse_args()
 
@@ -281,29 +474,36 @@ Examples:
             'wordlist': args.wordlist,
             'simple_mode': args.simple,
             'verify_ssl': not args.no_ssl,
+            'ipv4_only': args.ipv4_only,
         }
         
         if args.threads:
             settings['threads'] = args.threads
         if args.types:
             settings['types'] = args.types.split(',')
+        if args.show_codes:
+            settings['show_codes'] = args.show_codes
         if args.format:
             settings['output_format'] = args.format
 
         # Initialize and run finder
-        if args.subdomains:
-            finder = PathFinder(**settings)
-            asyncio.run(finder.scan_subdomains())
-        else:
-            if not args.target.startswith(('http://', 'https://')):
-                settings['target'] = f"https://{args.target}"
-            finder = PathFinder(**settings)
-            asyncio.run(finder.scan_directories())
+        if not args.subdomains and not args.target.startswith(('http://', 'https://')):
+            settings['target'] = f"https://{args.target}"
         
-        # Export results if needed
-        if args.out:
-            finder.export_results(args.out)
-            console.print(f"[green]Results saved to {args.out}[/]")
+        async def _run():
+            # Keep the session open for the whole run, including the export
+            async with PathFinder(**settings) as finder:
+                if args.subdomains:
+                    await finder.scan_subdomains()
+                else:
+                    await finder.scan_directories()
+                
+                # Export results if needed
+                if args.out:
+                    finder.export_results(args.out)
+                    console.print(f"[green]Results saved to {args.out}[/]")
+
+        _run_event_loop(_run())
 
     except KeyboardInterrupt:
         console.print("\n[red]Scan interrupted by user[/]")
@@ -19,10 +19,12 @@ setup(
         'pathfinder_web': ['wordlists.txt'],
     },
     install_requires=[
-        "aiohttp>=3.8.0",
+        "httpx[http2]>=0.23.0",
         "rich>=12.0.0",
         "requests>=2.28.0",
-        "dnspython>=2.2.0",
+        "aiodns>=3.0.0,<4",
+        "orjson>=3.6.0",
+        "uvloop>=0.18.0; sys_platform != 'win32'",
     ],
     entry_points={
         "console_scripts": [